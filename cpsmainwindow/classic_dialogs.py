@@ -5,7 +5,7 @@ import PySide2.QtWidgets as QtWidgets
 
 class FileDialog(QtWidgets.QFileDialog):
     """ Custom file dialog, that transfers succesfully selected files to a provided slot """
-    def __init__(self, slot, dont_use_native=False, parent=None):
+    def __init__(self, slot, dont_use_native=True, parent=None):
         super().__init__(parent=parent)
         self.setFileMode(QtWidgets.QFileDialog.ExistingFile)
         self.fileSelected.connect(slot)
@@ -36,44 +36,44 @@ class FileDialog(QtWidgets.QFileDialog):
 
 class SaveAsFileDialog(FileDialog):
     """ Custom save as file dialog that reports to a given slot """
-    def __init__(self, slot, parent=None):
-        super().__init__(slot, dont_use_native=False, parent=parent)
+    def __init__(self, slot, dont_use_native=True, parent=None):
+        super().__init__(slot, dont_use_native=dont_use_native, parent=parent)
         self.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
         self.setWindowTitle('Save as...')
 
 
 class OpenFileDialog(FileDialog):
     """ Custom save as file dialog that reports to a given slot """
-    def __init__(self, slot, parent=None):
-        super().__init__(slot, dont_use_native=False, parent=parent)
+    def __init__(self, slot, dont_use_native=True, parent=None):
+        super().__init__(slot, dont_use_native=dont_use_native, parent=parent)
         self.setAcceptMode(QtWidgets.QFileDialog.AcceptOpen)
         self.setWindowTitle('Open...')
 
 
 class WidgetDialog(QtWidgets.QDialog):
-    """ Standard dialog with buttons """
+    """ Standard dialog with buttons, which is deleted when it is closed """
     def __init__(self, title, main_widget, parent=None):
         super().__init__(parent=parent)
         self.setModal(True)
-        self.top_layout = QtWidgets.QVBoxLayout()
-        self.button_layout = QtWidgets.QHBoxLayout()
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        self.grid_layout = QtWidgets.QGridLayout()
         self.setup_layout(main_widget)
         self.setWindowTitle(title)
 
     def setup_layout(self, main_widget):
-        """ Sets up the dialog layout """
-        self.top_layout.addWidget(main_widget)
-        self.top_layout.addStretch()
-        self.top_layout.addLayout(self.button_layout)
-        self.button_layout.addStretch()
-        self.setLayout(self.top_layout)
+        """ Sets up the dialog layout, with the main widget on top and the buttons at the bottom
+        right """
+        self.grid_layout.addWidget(main_widget, 0, 0, 1, 2)
+        self.grid_layout.setRowStretch(1, 1)
+        self.grid_layout.setColumnStretch(0, 1)
+        self.setLayout(self.grid_layout)
 
     def add_buttons(self, buttons):
         """ sets up the button box """
         buttons = QtWidgets.QDialogButtonBox(buttons, QtCore.Qt.Horizontal, parent=self)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
-        self.button_layout.addWidget(buttons)
+        self.grid_layout.addWidget(buttons, 2, 1)
 
 
 class OkDialog(WidgetDialog):
@@ -1,14 +1,18 @@
 """ Classic main window module """
-import sys
 import os.path as op
 import re
+import locale
+from functools import cached_property
 
 import PySide2.QtWidgets as QtWidgets
 import PySide2.QtCore as QtCore
+import PySide2.QtGui as QtGui
 
 import cpsmainwindow.classic_menubar as menubar
 import cpsmainwindow.classic_dialogs as dialog
 
+_HTML_TAG_RE = re.compile(r'<[^<>]+>')
+
 
 class CpsmainwindowException(Exception):
     """ Root exception for cpsmainwindow """
@@ -29,28 +33,38 @@ class ClassicMainWindow(QtWidgets.QMainWindow):
     and all other windows are children of this window.
     """
 
-    def __init__(self, application, app_name, parent=None):
+    def __init__(self, application, app_name, parent=None, org_name=None):
         super().__init__(parent)
         self.application = application
         self.application.setActiveWindow(self)
+        self.application.aboutToQuit.connect(self.application.deleteLater,
+                                             QtCore.Qt.UniqueConnection)
         self.app_name = app_name
+        self.set_application_names(org_name, app_name)
         self.setMenuBar(menubar.ClassicMenuBar(parent=self))
         self.set_statusbar()
         self.resize_window(width=800, height=600)
         self.center_window()
 
+    def set_application_names(self, org_name, app_name):
+        """ Sets the organization and application name once for the application, such that all
+        QSettings instances share them """
+        if org_name:
+            self.application.setOrganizationName(org_name)
+        if app_name:
+            self.application.setApplicationName(app_name)
+
     def resize_window(self, width, height):
         """ Set the window's size """
         self.setMinimumWidth(width)
         self.setMinimumHeight(height)
 
     def center_window(self):
-        """ Centers the window on the screen """
+        """ Centers the window on the screen under the cursor """
+        screen = QtGui.QGuiApplication.screenAt(QtGui.QCursor.pos()) or \
+            QtGui.QGuiApplication.primaryScreen()
         frame_geometry = self.frameGeometry()
-        desktop = self.application.desktop()
-        screen = desktop.screenNumber(desktop.cursor().pos())
-        center_point = desktop.screenGeometry(screen).center()
-        frame_geometry.moveCenter(center_point)
+        frame_geometry.moveCenter(screen.geometry().center())
         self.move(frame_geometry.topLeft())
 
     def add_menu(self, title):
@@ -72,7 +86,6 @@ class ClassicMainWindow(QtWidgets.QMainWindow):
 
     def run(self, data_file=None):
         """ Shows the classic maindow and start the main event loop """
-        self.application.aboutToQuit.connect(self.application.deleteLater)
         self.show()
         self.application.exec_()
 
@@ -84,7 +97,6 @@ class ClassicMainWindow(QtWidgets.QMainWindow):
     def request_exit(self):
         """ Handles the exit request for the main window """
         self.application.exit()
-        sys.exit(0)
 
 
 class ClassicFileMainWindow(ClassicMainWindow):
@@ -94,15 +106,32 @@ class ClassicFileMainWindow(ClassicMainWindow):
     files etc.
     """
     def __init__(self, application, org_name=None, app_name=None, parent=None):
-        super().__init__(application, app_name, parent)
+        super().__init__(application, app_name, parent, org_name)
         self._filename = None
         self.start_path = op.join(op.expanduser('~'), 'Documents')
-        self.saveas_dialog = dialog.SaveAsFileDialog(slot=self.save_to_file, parent=self)
-        self.open_dialog = dialog.OpenFileDialog(slot=self.load_file, parent=self)
+        self._pending_extension = None
         self.callbacks = {'set_contents': None, 'get_contents': None, 'clear_contents': None}
         self.is_dirty = False
+        self._loading_filename = None
         self.set_filename()
-        self.save_action, self.recent_files = self.fill_menubar(org_name, app_name)
+        self.save_action, self.recent_files = self.fill_menubar()
+
+    @cached_property
+    def saveas_dialog(self):
+        """ The save as dialog, which is only created upon first use """
+        return self.create_file_dialog(dialog.SaveAsFileDialog, self.save_to_file)
+
+    @cached_property
+    def open_dialog(self):
+        """ The open file dialog, which is only created upon first use """
+        return self.create_file_dialog(dialog.OpenFileDialog, self.load_file)
+
+    def create_file_dialog(self, dialog_class, slot):
+        """ Creates a file dialog and applies the file type, if it has already been set """
+        file_dialog = dialog_class(slot=slot, parent=self)
+        if self._pending_extension:
+            file_dialog.set_extension(self._pending_extension)
+        return file_dialog
 
     def run_callback(self, callback_type, *args):
         """ Runs a callback function of given type """
@@ -111,17 +140,16 @@ class ClassicFileMainWindow(ClassicMainWindow):
             return callback(*args)
         raise CallbackException(f'Callback of type {callback_type} is not defined!')
 
-    def set_signals(self, **kwargs):
-        """ Connects a given signal to available slot """
-        for slot_str, signal in kwargs.items():
-            try:
-                slot = getattr(self, slot_str)
-            except AttributeError as err:
-                raise NoSlotException(f'The slot named {slot_str} is not available!') from err
-            else:
-                signal.connect(slot)
+    @staticmethod
+    def set_connections(pairs):
+        """ Connects signals to slots, given as (signal, slot) pairs, e.g. (signal, self.set_dirty)
+        """
+        for signal, slot in pairs:
+            if not callable(slot):
+                raise NoSlotException(f'The slot {slot!r} is not callable!')
+            signal.connect(slot)
 
-    def fill_menubar(self, org_name, app_name):
+    def fill_menubar(self):
         """ Set ClassicMenuBar as the window's MenuBar and connect its signals to ClassicMainWindow
         slots """
         file_menu = self.add_menu('&File')
@@ -130,7 +158,7 @@ class ClassicFileMainWindow(ClassicMainWindow):
         save_action = file_menu.connect_action(self.save_file_request, '&Save', shortcut='Ctrl+S', status_tip='Save the current file ...')
         save_action.setDisabled(True)
         file_menu.connect_action(self.show_save_as_dialog, '&Save as...', shortcut='Ctrl+Shift+S', status_tip='Save as another file ...')
-        recent_files = file_menu.add_recent_files(self.show_open_dialog, org_name, app_name)
+        recent_files = file_menu.add_recent_files(self.show_open_dialog)
         file_menu.connect_action(self.request_exit, '&Exit', shortcut='Ctrl+Q', status_tip='Exit the application')
         help_menu = self.add_menu('&Help')
         help_menu.connect_action(self.about_qt, '&About Qt', status_tip='Display information about Qt')
@@ -142,19 +170,27 @@ class ClassicFileMainWindow(ClassicMainWindow):
         self.set_window_title()
 
     def set_window_title(self):
-        """ Sets the window title """
+        """ Sets the window title, if it changed """
         is_dirty_star = '*' if self.is_dirty else ''
-        self.setWindowTitle(f'{is_dirty_star}{self._filename} - {self.app_name}')
+        window_title = f'{is_dirty_star}{self._filename} - {self.app_name}'
+        if window_title != self.windowTitle():
+            self.setWindowTitle(window_title)
 
     def set_file_type(self, extension):
-        """ Set the file type for openeing and saving files """
-        self.saveas_dialog.set_extension(extension)
-        self.open_dialog.set_extension(extension)
+        """ Set the file type for openeing and saving files. Dialogs that have not been created
+        yet, will use the file type once they are created """
+        self._pending_extension = extension
+        for dialog_name in ('saveas_dialog', 'open_dialog'):
+            if dialog_name in self.__dict__:
+                self.__dict__[dialog_name].set_extension(extension)
 
     @QtCore.Slot(bool)
     def set_dirty(self, is_dirty=True):
         """ Sets the currently opened file to dirty, i.e. it has unsaved changes or, when is_dirty
-        is False, sets the currently opened file as saved, i.e. changes have been saved """
+        is False, sets the currently opened file as saved, i.e. changes have been saved. Changes
+        cancel a file load that is still running """
+        if is_dirty:
+            self._loading_filename = None
         if self.is_dirty == is_dirty:
             return
         self.is_dirty = is_dirty
@@ -164,30 +200,62 @@ class ClassicFileMainWindow(ClassicMainWindow):
 
     @QtCore.Slot(str)
     def load_file(self, filename):
-        """ Reads a file contents into the text editor """
-        try:
-            with open(filename, 'r') as file:
-                self.run_callback('set_contents', file.read())
-        except FileNotFoundError:
-            self.recent_files.remove_file(filename)
-        else:
-            self.set_filename(filename)
-            self.set_dirty(is_dirty=False)
-            self.recent_files.add_file(filename)
+        """ Reads a file contents in a background thread and passes them to the text editor once
+        they have been read. Only the most recently requested file is passed on """
+        self._loading_filename = filename
+        reader = _FileReader(filename)
+        reader.signals.finished.connect(self.set_loaded_contents)
+        reader.signals.failed.connect(self.report_load_failure)
+        QtCore.QThreadPool.globalInstance().start(reader)
+
+    @QtCore.Slot(str, str)
+    def set_loaded_contents(self, filename, contents):
+        """ Passes the contents of a loaded file to the text editor, unless another file has been
+        requested or the contents have been changed in the meantime """
+        if filename != self._loading_filename:
+            return
+        self._loading_filename = None
+        self.run_callback('set_contents', contents)
+        self.set_filename(filename)
+        self.set_dirty(is_dirty=False)
+        self.recent_files.add_file(filename)
+
+    @QtCore.Slot(str)
+    def report_load_failure(self, filename):
+        """ Removes a file that could not be loaded from the recent files and shows a warning, if
+        it is the most recently requested file """
+        self.recent_files.remove_file(filename)
+        if filename != self._loading_filename:
+            return
+        self._loading_filename = None
+        warning(self, f'opening <b>{op.basename(filename)}</b>')
 
     @QtCore.Slot(str)
     def save_to_file(self, filename):
-        """ Saves the text editor's contents to file """
-        with open(filename, 'w') as file:
-            file.write(self.run_callback('get_contents'))
+        """ Saves the text editor's contents to file, the file is only replaced if all contents
+        have been written successfully. Cancels a file load that is still running """
+        self._loading_filename = None
+        file = QtCore.QSaveFile(filename)
+        if file.open(QtCore.QIODevice.WriteOnly | QtCore.QIODevice.Text):
+            try:
+                data = self.run_callback('get_contents').encode(locale.getpreferredencoding(False))
+            except UnicodeEncodeError:
+                file.cancelWriting()
+            else:
+                if file.write(data) != len(data):
+                    file.cancelWriting()
+        if not file.commit():
+            warning(self, f'saving <b>{op.basename(filename)}</b>')
+            return
         self.set_filename(filename)
         self.set_dirty(is_dirty=False)
         self.recent_files.add_file(filename)
 
     @QtCore.Slot()
     def show_new_dialog(self):
-        """ Shows the new dialog """
+        """ Shows the new dialog, a new file cancels a file load that is still running """
         if not self.is_dirty or request(self, 'start a new data file'):
+            self._loading_filename = None
             self.run_callback('clear_contents')
             self.set_filename('untitled')
             self.set_dirty(is_dirty=False)
@@ -253,7 +321,7 @@ def warning(parent, core_message):
 
 def generate_window_title(message, max_title_length=40):
     """ Generate a window title with max. length and without HTML tags """
-    message = re.sub('<[^<]+?>', '', message)
+    message = _HTML_TAG_RE.sub('', message)
     window_title = message[:1].upper() + message[1:] + ' ...'
     if len(window_title) > max_title_length:
         window_title = window_title[:max_title_length]
@@ -261,11 +329,33 @@ def generate_window_title(message, max_title_length=40):
 
 
 def toplevel_widget(widget):
-    """ Returns the top-level widget (i.e. the widget that has no parent) """
-    top_widget = widget
-    while top_widget.parentWidget():
-        top_widget = top_widget.parentWidget()
-    return top_widget
+    """ Returns the top-level widget (i.e. the window that contains widget) """
+    return widget.window()
+
+
+class _FileReaderSignals(QtCore.QObject):
+    """ Signals of _FileReader, which are delivered to the thread that created the reader """
+    finished = QtCore.Signal(str, str)
+    failed = QtCore.Signal(str)
+
+
+class _FileReader(QtCore.QRunnable):
+    """ Reads a file's contents in a thread pool and emits them with the filename """
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.signals = _FileReaderSignals()
+
+    def run(self):
+        """ Reads the file and emits finished with its contents, or failed if it cannot be read or
+        decoded """
+        try:
+            with open(self.filename, 'r') as file:
+                contents = file.read()
+        except (OSError, UnicodeDecodeError):
+            self.signals.failed.emit(self.filename)
+        else:
+            self.signals.finished.emit(self.filename, contents)
 
 
 class DefaultMessageStatusbar(QtWidgets.QStatusBar):
@@ -77,18 +77,19 @@ class ClassicMenu(QtWidgets.QMenu):
         action.triggered.connect(slot)
         return action
 
-    def add_recent_files(self, slot, org_name, app_name):
+    def add_recent_files(self, slot):
         """ Adds a recent files actions to the QMenu and connects all actions to slot """
         self.create_separator()
         anchor = self.create_separator()
-        self.recent_files = recent_files.RecentlyOpenedFiles(self, anchor, org=org_name,
-                                                             app=app_name, parent=self)
+        self.recent_files = recent_files.RecentlyOpenedFiles(self, anchor, parent=self)
         self.recent_files.fileTriggered.connect(slot)
         return self.recent_files
 
 
 class ClassicMenuBar(QtWidgets.QMenuBar):
     """ A classic menubar """
+    _AMP_DROP = str.maketrans('', '', '&')
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.menus = {}
@@ -108,7 +109,7 @@ class ClassicMenuBar(QtWidgets.QMenuBar):
         self.menus[self.title_to_tag(title)] = menu
         return menu
 
-    @staticmethod
-    def title_to_tag(title):
+    @classmethod
+    def title_to_tag(cls, title):
         """ Converts a title into a tag """
-        return title.replace('&', '').lower()
+        return title.translate(cls._AMP_DROP).lower()
@@ -1,40 +1,57 @@
 """ Tools to track recently opened files and display them in the file menu """
 
+from collections import OrderedDict
+
 import PySide2.QtWidgets as QtWidgets
 import PySide2.QtCore as QtCore
 
 
 class RecentlyOpenedFiles(QtCore.QObject):
-    """ Tracks recently opened files and shows the latest files the file menu """
+    """ Tracks recently opened files and shows the latest files the file menu. The files are
+    stored in the application's settings, using the application's organization and application
+    name. If no organization name is set, Qt falls back to "Unknown Organization" """
     filesChanged = QtCore.Signal(list)
     fileTriggered = QtCore.Signal(str)
-    defaultOrganization = 'Unknwon organization'
     max_no_files = 10
     max_length = 40
     remain_start = 10
     remain_end = 25
+    save_delay = 100
 
     def __init__(self, menu, anchor, **kwargs):
         super().__init__(parent=kwargs.get('parent'))
         self.actions = list()
-        self.filenames = list()
+        self.action_filenames = list()
+        self._filenames = OrderedDict()
         self.clear_actions = list()
-        org_name = kwargs.get('org', self.defaultOrganization)
-        app_name = kwargs.get('app')
-        self.settings = QtCore.QSettings(org_name, app_name)
+        self.menu = None
+        self.settings = QtCore.QSettings()
+        self.save_timer = QtCore.QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.save_delay)
+        self.save_timer.timeout.connect(self.save_settings)
+        QtCore.QCoreApplication.instance().aboutToQuit.connect(self.flush_settings)
         self.create_actions(menu, anchor)
         self.load_files_from_settings()
 
     def create_actions(self, menu, anchor):
-        """ Create all actions and disable visibility """
-        for _ in range(self.max_no_files):
+        """ Create the first action and the clear actions, further actions are created once
+        they are needed """
+        self.menu = menu
+        self.create_clear_actions(menu, anchor)
+        self.ensure_action(0)
+        self.set_no_recent_files_action()
+
+    def ensure_action(self, index):
+        """ Creates invisible actions up to and including index, if they don't exist yet """
+        while len(self.actions) <= index:
             action = QtWidgets.QAction()
             action.setVisible(False)
-            action.triggered.connect(self.file_triggered)
-            menu.insertAction(anchor, action)
+            action.triggered.connect(
+                lambda _=False, action_index=len(self.actions): self.file_triggered(action_index))
+            self.menu.insertAction(self.clear_actions[0], action)
             self.actions.append(action)
-        self.create_clear_actions(menu, anchor)
-        self.set_no_recent_files_action()
+            self.action_filenames.append(None)
 
     def create_clear_actions(self, menu, anchor):
         """ Creates the actions the enable to clear all recent files """
@@ -54,6 +71,7 @@ class RecentlyOpenedFiles(QtCore.QObject):
         first_action_visible = first_action.isVisible()
         if not first_action_visible:
             first_action.setText('No recent files')
+            self.action_filenames[0] = None
             first_action.setEnabled(False)
             first_action.setVisible(True)
         for action in self.clear_actions:
@@ -64,58 +82,95 @@ class RecentlyOpenedFiles(QtCore.QObject):
         files = self.settings.value('recent_files_list', [[]])[0]
         self.load_files(files)
 
+    @QtCore.Slot()
+    def save_settings(self):
+        """ Saves the recently opened files to the settings """
+        self.settings.setValue('recent_files_list', [self.filenames])
+
+    @QtCore.Slot()
+    def flush_settings(self):
+        """ Saves the recently opened files immediately, if saving is still pending """
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self.save_settings()
+            self.settings.sync()
+
     def clear_settings(self):
         """ Clears all recently opened files from the settings """
+        self.save_timer.stop()
         self.settings.remove('recent_files_list')
-        self.load_files_from_settings()
-        self.update_actions()
+        self.load_files([])
+
+    @property
+    def filenames(self):
+        """ The recently opened files, most recent first """
+        return list(self._filenames)
+
+    @filenames.setter
+    def filenames(self, file_list):
+        self._filenames = OrderedDict.fromkeys(file_list)
+        while len(self._filenames) > self.max_no_files:
+            self._filenames.popitem(last=True)
 
     def load_files(self, file_list):
         """
         Loads filenames_list into self.filenames, entries beyond self.max_no_files are ignored
         """
-        self.filenames = file_list[:self.max_no_files]
+        self.filenames = file_list
         self.update_actions()
 
-    def enable_action(self, action, filename):
-        """ Update a given action """
-        text = shorten_name(filename, self.max_length, self.remain_start, self.remain_end)
-        action.setText(text)
-        action.setStatusTip(f'Open {filename}')
-        action.setData(filename)
+    def enable_action(self, index, filename):
+        """ Update the action at index, its text is only updated if the filename changed """
+        self.ensure_action(index)
+        action = self.actions[index]
+        if self.action_filenames[index] != filename:
+            text = shorten_name(filename, self.max_length, self.remain_start, self.remain_end)
+            action.setText(text)
+            action.setStatusTip(f'Open {filename}')
+            self.action_filenames[index] = filename
         action.setEnabled(True)
         action.setVisible(True)
 
     def update_actions(self):
         """ Enables all actions according to self.filenames, disables others """
-        for action, filename in zip(self.actions, self.filenames):
-            self.enable_action(action, filename)
-        for action in self.actions[len(self.filenames):]:
-            action.setVisible(False)
-        self.set_no_recent_files_action()
-        self.filesChanged.emit(self.filenames)
+        filenames = self.filenames
+        if filenames:
+            self.ensure_action(len(filenames) - 1)
+        updates_enabled = self.menu.updatesEnabled()
+        self.menu.setUpdatesEnabled(False)
+        were_blocked = [action.blockSignals(True) for action in self.actions]
+        try:
+            for index, filename in enumerate(filenames):
+                self.enable_action(index, filename)
+            for action in self.actions[len(filenames):]:
+                action.setVisible(False)
+            self.set_no_recent_files_action()
+        finally:
+            for action, was_blocked in zip(self.actions, were_blocked):
+                action.blockSignals(was_blocked)
+            self.menu.setUpdatesEnabled(updates_enabled)
+        self.filesChanged.emit(filenames)
 
     @QtCore.Slot(str)
     def add_file(self, filename):
         """ Add a recently opened file, remove duplicates and excess filenames and update actions
         """
-        self.filenames.insert(0, filename)
-        del self.filenames[self.max_no_files:]
-        self.filenames = list(dict.fromkeys(self.filenames))
-        self.settings.setValue('recent_files_list', [self.filenames])
+        self._filenames[filename] = None
+        self._filenames.move_to_end(filename, last=False)
+        while len(self._filenames) > self.max_no_files:
+            self._filenames.popitem(last=True)
+        self.save_timer.start()
         self.update_actions()
 
     @QtCore.Slot(str)
     def remove_file(self, filename):
         """ Remove a recently opened file, e.g. if the link is not valid anymore """
-        self.filenames.remove(filename)
+        self._filenames.pop(filename, None)
         self.update_actions()
 
-    @QtCore.Slot()
-    def file_triggered(self):
+    def file_triggered(self, index):
         """ If a recently opened file action is triggered, the corresponding filename is emitted """
-        sender = self.sender()
-        self.fileTriggered.emit(sender.data())
+        self.fileTriggered.emit(self.action_filenames[index])
 
 
 def shorten_name(name, max_length, remain_start, remain_end):
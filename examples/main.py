@@ -20,14 +20,15 @@ def about_dialog(parent_window):
 def main(data_file=None):
     """ Main function, create a classic text editor and runs it """
     application = QtWidgets.QApplication(sys.argv)
-    window = cpm.ClassicFileMainWindow(application, app_name="Classic Text Editor")
+    window = cpm.ClassicFileMainWindow(application, org_name="cpsmainwindow",
+                                       app_name="Classic Text Editor")
     window.set_file_type('txt')
     text_editor = QtWidgets.QTextEdit()
     window.setCentralWidget(text_editor)
     window.callbacks = {'set_contents': text_editor.setPlainText,
                         'get_contents': text_editor.toPlainText,
                         'clear_contents': text_editor.clear}
-    text_editor.textChanged.connect(window.set_dirty)
+    window.set_connections([(text_editor.textChanged, window.set_dirty)])
 
     edit_menu = window.insert_menu(before_tag='help', title='&Edit')
     edit_menu.connect_action(text_editor.undo, '&Undo', shortcut='Ctrl+Z')
@@ -38,7 +39,7 @@ def main(data_file=None):
     edit_menu.connect_action(text_editor.cut, 'Cut', shortcut='Ctrl+X')
 
     help_menu = window.menu('help')
-    help_menu.connect_action(about_dialog(window).show, 'About Classic Text Editor')
+    help_menu.connect_action(lambda: about_dialog(window).show(), 'About Classic Text Editor')
 
     window.run(data_file)
 
@@ -11,6 +11,7 @@ setup(
     license='LICENSE',
     description='A classic main window implementation for PySide',
     long_description=open('README.md').read(),
+    python_requires='>=3.8',
     install_requires=['PySide2',
                       'shiboken2']
 )